@@ -1,18 +1,30 @@
 import os
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory
 from flask_cors import CORS
 from dotenv import load_dotenv
 import google.generativeai as genai
 import requests
 import json
 import uuid
-from datetime import datetime # Changed import for datetime
+from datetime import datetime, date # Changed import for datetime
 import threading
+import sqlite3
+import gzip
+import hashlib
+import mmap
+import struct
+import click
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from flask_sqlalchemy import SQLAlchemy # Added SQLAlchemy import
 from werkzeug.security import generate_password_hash, check_password_hash # Added check_password_hash
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user # Added Flask-Login imports
 
+try:
+    import brotli # Optional: enables pre-compressed .br snapshots
+except ImportError:
+    brotli = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -47,6 +59,28 @@ PRACTICE_SETS_DIR.mkdir(exist_ok=True)
 JOBS_DIR = Path('jobs')
 JOBS_DIR.mkdir(exist_ok=True)
 
+# Immutable snapshots of practice sets, served as static files. Both deploys
+# expose them at /static/practice-sets/ (Flask serves static/, Netlify public/).
+# A small pointer per set ID in /static/practice-sets-latest/ names its snapshot.
+SNAPSHOT_SUBDIR = 'practice-sets'
+SNAPSHOT_POINTER_SUBDIR = 'practice-sets-latest'
+SNAPSHOT_DIR = Path(app.static_folder) / SNAPSHOT_SUBDIR
+NETLIFY_SNAPSHOT_DIR = Path('public') / 'static' / SNAPSHOT_SUBDIR
+SNAPSHOT_MAX_AGE = 31536000 # One year; snapshot file names change with their content
+SNAPSHOT_POINTER_MAX_AGE = 300 # Pointers only change if a set is republished
+
+# Offline English-Turkish dictionary, compiled from the bundled word list
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+DICTIONARY_SOURCE = DATA_DIR / 'en_tr.tsv'
+DICTIONARY_PATH = DATA_DIR / 'en_tr.dict'
+dictionary_lock = threading.Lock()
+dictionary_map = None
+
+# Full-text search index over the practice set library (SQLite FTS5)
+SEARCH_INDEX_PATH = PRACTICE_SETS_DIR / 'search_index.db'
+search_index_lock = threading.Lock()
+search_index_ready = False
+
 # Store the latest practice set ID
 current_practice_set_id = None
 
@@ -224,6 +258,28 @@ def generate_practice():
     if not api_key_to_use:
         return jsonify({"error": "No Gemini API key available"}), 500
     
+    # Get the requested question type, default to 'fitb'
+    question_type = data.get('question_type', 'fitb')
+    
+    # Validate the request before a job is created for it
+    pipeline_mode = data.get('mode') == 'pipeline'
+    if pipeline_mode:
+        # Pipeline mode: one passage per set, all question types derived from it
+        try:
+            count = int(data.get('count', 1))
+        except (TypeError, ValueError):
+            return jsonify({"error": "count must be an integer"}), 400
+        if count < 1 or count > PIPELINE_MAX_COUNT:
+            return jsonify({"error": f"count must be between 1 and {PIPELINE_MAX_COUNT}"}), 400
+        
+        passage_set_id = data.get('passage_set_id')
+        if passage_set_id:
+            source_set = load_practice_set(passage_set_id)
+            if source_set is None:
+                return jsonify({"error": "Practice set to reuse was not found"}), 404
+            if len(paragraphs_from_set(source_set)) < PIPELINE_MIN_PARAGRAPHS:
+                return jsonify({"error": f"Passage to reuse needs at least {PIPELINE_MIN_PARAGRAPHS} paragraphs"}), 400
+    
     # Generate a unique job ID
     job_id = str(uuid.uuid4())
     
@@ -239,14 +295,15 @@ def generate_practice():
     # Save initial job status
     save_job_status(job_id, job_status)
     
-    # Get the requested question type, default to 'fitb'
-    question_type = data.get('question_type', 'fitb')
+    if pipeline_mode:
+        target = generate_pipeline_async
+        args = (job_id, api_key_to_use, count, passage_set_id)
+    else:
+        target = generate_practice_async
+        args = (job_id, api_key_to_use, question_type)
     
     # Start the generation process in a background thread
-    thread = threading.Thread(
-        target=generate_practice_async,
-        args=(job_id, api_key_to_use, question_type)
-    )
+    thread = threading.Thread(target=target, args=args)
     thread.daemon = True  # Thread will exit when main thread exits
     thread.start()
     
@@ -434,26 +491,9 @@ def generate_practice_async(job_id, api_key_to_use, question_type='fitb'):
             })
             return
         
-        # Find JSON content within the response (handling potential markdown code blocks)
-        json_content = response_text
-        if "```json" in response_text:
-            json_content = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            json_content = response_text.split("```")[1].split("```")[0].strip()
-            
-        # Parse the JSON
-        practice_set = json.loads(json_content)
-        
-        # Generate a unique ID for this practice set
-        practice_id = str(uuid.uuid4())
-        
-        # Add metadata to the practice set
-        practice_set['id'] = practice_id
-        practice_set['created_at'] = datetime.now().isoformat() # Use imported datetime
-        practice_set['shareUrl'] = f"//?id={practice_id}"
-        
-        # Save the practice set to a file
-        save_practice_set(practice_id, practice_set)
+        # Parse the JSON and save it as a new practice set
+        practice_set = parse_model_json(response_text)
+        practice_id = store_generated_set(practice_set)
         
         # Update the current practice set ID
         current_practice_set_id = practice_id
@@ -471,11 +511,254 @@ def generate_practice_async(job_id, api_key_to_use, question_type='fitb'):
             'error': str(e)
         })
 
+def parse_model_json(response_text):
+    """Parse the JSON payload of a model response"""
+    # Find JSON content within the response (handling potential markdown code blocks)
+    json_content = response_text
+    if "```json" in response_text:
+        json_content = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        json_content = response_text.split("```")[1].split("```")[0].strip()
+    
+    return json.loads(json_content)
+
+def store_generated_set(practice_set):
+    """Give a generated practice set an ID and metadata, save it and return the ID"""
+    # Generate a unique ID for this practice set
+    practice_id = str(uuid.uuid4())
+    
+    # Add metadata to the practice set
+    practice_set['id'] = practice_id
+    practice_set['created_at'] = datetime.now().isoformat() # Use imported datetime
+    practice_set['shareUrl'] = f"//?id={practice_id}"
+    
+    # Save the practice set to a file
+    save_practice_set(practice_id, practice_set)
+    return practice_id
+
+# --- Generation Pipeline ---
+# Most of the output tokens of a generation go into the passage, so the
+# pipeline writes each passage once and derives every question type from it.
+PIPELINE_MAX_COUNT = 10
+PIPELINE_MAX_WORKERS = 4
+PIPELINE_MIN_PARAGRAPHS = 3
+PIPELINE_FITB_COUNT = 5
+PIPELINE_TFNG_COUNT = 5
+TFNG_ANSWERS = ('True', 'False', 'Not Given')
+
+PROMPT_PIPELINE_PASSAGE = """
+Write a reading passage (800-1000 words) on a general interest topic suitable for IELTS Academic.
+The passage must be divided into 4 or 5 distinct paragraphs, each with a clear main idea.
+
+Return the result in the following JSON format:
+{
+    "title": "Short title of the passage",
+    "paragraphs": [
+        {"id": "A", "content": "Text of paragraph A..."},
+        {"id": "B", "content": "Text of paragraph B..."},
+        {"id": "C", "content": "Text of paragraph C..."},
+        {"id": "D", "content": "Text of paragraph D..."}
+    ]
+}
+
+IMPORTANT:
+- Paragraph ids must be consecutive capital letters starting at "A".
+- Do not include any questions.
+"""
+
+PROMPT_PIPELINE_QUESTIONS = """
+Below is an IELTS Academic reading passage, given as a JSON list of paragraphs.
+Do NOT repeat the passage in your answer. Write the following questions about it:
+
+1. 5 "fill-in-the-blank" questions (question_type "FITB"), each with the exact sentence from the passage where the answer can be found.
+2. 5 "True/False/Not Given" questions (question_type "TFNG").
+3. A "Matching Headings" task: a list of headings with 2 to 3 more headings than there are paragraphs, and the correct heading for each paragraph.
+
+IMPORTANT:
+- The fill-in-the-blank questions should be challenging: paraphrase, reorder and restructure the sentences from the passage, using synonyms while preserving meaning.
+- The fill-in-the-blank answers must be exact words or short phrases copied directly from the passage.
+- For True/False/Not Given questions, the answer must be exactly "True", "False", or "Not Given", and relevant_passage must be an EXACT copy of 1-2 sentences from the passage.
+- Heading ids must be lower-case Roman numerals ("i", "ii", ...). The answers object maps every paragraph id to exactly one heading id.
+
+Return the result in the following JSON format:
+{
+    "questions": [
+        {
+            "id": 1,
+            "question_type": "FITB",
+            "question": "The text containing a _____ where a word from the passage should go.",
+            "answer": "exact word or phrase from the passage",
+            "source_sentence": "The complete sentence from the passage that contains the answer."
+        },
+        {
+            "id": 6,
+            "question_type": "TFNG",
+            "statement": "A statement to evaluate against the passage.",
+            "answer": "True",
+            "relevant_passage": "The portion of the passage that is relevant to this statement."
+        }
+    ],
+    "headings": [
+        {"id": "i", "text": "Heading text 1"},
+        {"id": "ii", "text": "Heading text 2"}
+    ],
+    "answers": {
+        "A": "ii",
+        "B": "i"
+    }
+}
+
+Passage paragraphs:
+"""
+
+def paragraphs_from_set(practice_set):
+    """Return the lettered paragraphs of an existing practice set"""
+    if practice_set.get('paragraphs'):
+        return practice_set['paragraphs']
+    
+    # FITB/TFNG sets only store the passage text, so split it on blank lines,
+    # or on single newlines for passages that do not use blank lines
+    passage = practice_set.get('passage', '')
+    blocks = [block.strip() for block in passage.split('\n\n') if block.strip()]
+    if len(blocks) < PIPELINE_MIN_PARAGRAPHS:
+        blocks = [block.strip() for block in passage.split('\n') if block.strip()]
+    return [{"id": chr(ord('A') + i), "content": block} for i, block in enumerate(blocks)]
+
+def generate_with_model(model, prompt):
+    """Run a prompt through the model and parse the JSON it returns"""
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "top_k": 40
+        }
+    )
+    return parse_model_json(response.text)
+
+def validate_derived_questions(derived, paragraphs):
+    """Raise ValueError unless the derived questions form complete practice sets"""
+    questions = derived.get('questions') or []
+    fitb_items = [q for q in questions if q.get('question_type') == 'FITB' and q.get('question') and q.get('answer')]
+    tfng_items = [q for q in questions if q.get('question_type') == 'TFNG' and q.get('statement') and q.get('answer') in TFNG_ANSWERS]
+    if len(fitb_items) < PIPELINE_FITB_COUNT:
+        raise ValueError(f"Expected {PIPELINE_FITB_COUNT} FITB questions, got {len(fitb_items)}")
+    if len(tfng_items) < PIPELINE_TFNG_COUNT:
+        raise ValueError(f"Expected {PIPELINE_TFNG_COUNT} TFNG questions, got {len(tfng_items)}")
+    
+    heading_ids = {h.get('id') for h in derived.get('headings') or [] if h.get('text')}
+    answers = derived.get('answers') or {}
+    paragraph_ids = [p['id'] for p in paragraphs]
+    if len(heading_ids) <= len(paragraph_ids):
+        raise ValueError("Matching headings task needs more headings than paragraphs")
+    missing = [pid for pid in paragraph_ids if answers.get(pid) not in heading_ids]
+    if missing:
+        raise ValueError(f"Matching headings answers do not cover paragraphs: {', '.join(missing)}")
+
+def run_pipeline_once(model, source_set=None):
+    """Produce one passage (or reuse one) and save a practice set per question type"""
+    if source_set is not None:
+        passage_id = source_set.get('passage_id', source_set['id'])
+        title = source_set.get('title')
+        paragraphs = paragraphs_from_set(source_set)
+    else:
+        passage_data = generate_with_model(model, PROMPT_PIPELINE_PASSAGE)
+        passage_id = str(uuid.uuid4())
+        title = passage_data.get('title')
+        paragraphs = passage_data.get('paragraphs') or []
+    
+    if len(paragraphs) < PIPELINE_MIN_PARAGRAPHS:
+        raise ValueError(f"Passage needs at least {PIPELINE_MIN_PARAGRAPHS} paragraphs, got {len(paragraphs)}")
+    
+    passage = '\n\n'.join(p['content'] for p in paragraphs)
+    derived = generate_with_model(
+        model,
+        PROMPT_PIPELINE_QUESTIONS + json.dumps(paragraphs, ensure_ascii=False)
+    )
+    validate_derived_questions(derived, paragraphs)
+    
+    # Shared fields let sets derived from the same passage be found together
+    shared = {'passage': passage, 'passage_id': passage_id}
+    if title:
+        shared['title'] = title
+    
+    fitb_tfng_set = {
+        **shared,
+        'questions': derived.get('questions', []),
+        'question_type': 'mixed_fitb_tfng'
+    }
+    matching_headings_set = {
+        **shared,
+        'paragraphs': paragraphs,
+        'headings': derived.get('headings', []),
+        'answers': derived.get('answers', {}),
+        'question_type': 'matching_headings'
+    }
+    
+    return [store_generated_set(fitb_tfng_set), store_generated_set(matching_headings_set)]
+
+def generate_pipeline_async(job_id, api_key_to_use, count=1, passage_set_id=None):
+    """Asynchronously generate `count` passages and derive every question type from each"""
+    global current_practice_set_id
+    
+    try:
+        genai.configure(api_key=api_key_to_use)
+        model = genai.GenerativeModel('gemini-2.5-flash-preview-05-20')
+        
+        source_set = load_practice_set(passage_set_id) if passage_set_id else None
+        
+        practice_set_ids = []
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(count, PIPELINE_MAX_WORKERS)) as executor:
+            futures = [executor.submit(run_pipeline_once, model, source_set) for _ in range(count)]
+            for future in as_completed(futures):
+                try:
+                    practice_set_ids.extend(future.result())
+                except Exception as e:
+                    print(f"Error in generation pipeline: {str(e)}")
+                    errors.append(str(e))
+        
+        if not practice_set_ids:
+            update_job_status(job_id, {
+                'status': JOB_STATUS_FAILED,
+                'error': errors[0] if errors else "No practice sets were generated"
+            })
+            return
+        
+        current_practice_set_id = practice_set_ids[0]
+        
+        update_job_status(job_id, {
+            'status': JOB_STATUS_COMPLETED,
+            'practice_set_id': practice_set_ids[0],
+            'practice_set_ids': practice_set_ids,
+            'errors': errors
+        })
+    
+    except Exception as e:
+        print(f"Error generating practice sets: {str(e)}")
+        update_job_status(job_id, {
+            'status': JOB_STATUS_FAILED,
+            'error': str(e)
+        })
+# --- End Generation Pipeline ---
+
 def save_practice_set(practice_id, practice_set):
     """Save a practice set to a file"""
     practice_file = PRACTICE_SETS_DIR / f"{practice_id}.json"
     with open(practice_file, 'w', encoding='utf-8') as f:
         json.dump(practice_set, f, ensure_ascii=False, indent=2)
+
+    # Keep the search index in step with the library
+    try:
+        index_practice_set(practice_id, practice_set)
+    except sqlite3.Error as e:
+        print(f"Error indexing practice set {practice_id}: {str(e)}")
+
+    # Publish a static snapshot so reads can skip the application
+    try:
+        publish_practice_set(practice_id, practice_set)
+    except (OSError, ValueError) as e:
+        print(f"Error publishing practice set {practice_id}: {str(e)}")
         
 def save_job_status(job_id, job_status):
     """Save job status to a file"""
@@ -508,6 +791,302 @@ def load_practice_set(practice_id):
     with open(practice_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+# --- Search Index ---
+def get_search_connection():
+    """Open a connection to the search index, creating the tables on first use"""
+    global search_index_ready
+
+    conn = sqlite3.connect(SEARCH_INDEX_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if search_index_ready:
+        return conn
+
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS practice_set_meta (
+            rowid INTEGER PRIMARY KEY,
+            practice_id TEXT UNIQUE NOT NULL,
+            question_type TEXT,
+            created_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_meta_type_date
+            ON practice_set_meta (question_type, created_at);
+        CREATE INDEX IF NOT EXISTS idx_meta_date
+            ON practice_set_meta (created_at);
+        CREATE VIRTUAL TABLE IF NOT EXISTS practice_set_fts USING fts5(
+            passage, headings, questions,
+            tokenize = 'porter unicode61'
+        );
+    """)
+    search_index_ready = True
+    return conn
+
+def normalize_timestamp(value, end_of_day=False):
+    """Parse an ISO date or timestamp into the naive local form stored in the index"""
+    parsed = datetime.fromisoformat(value.strip())
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    if end_of_day:
+        # Dates without a time component include the whole day
+        try:
+            date.fromisoformat(value.strip())
+            parsed = datetime.combine(parsed.date(), datetime.max.time())
+        except ValueError:
+            pass
+    # A fixed width keeps string comparison in SQLite chronological
+    return parsed.isoformat(timespec='microseconds')
+
+def extract_search_fields(practice_set):
+    """Collect the passage, heading and question text of a practice set"""
+    passage = practice_set.get('passage') or ''
+    if not passage and practice_set.get('paragraphs'):
+        passage = '\n\n'.join(p.get('content', '') for p in practice_set['paragraphs'])
+
+    headings = ' '.join(h.get('text', '') for h in practice_set.get('headings') or [])
+
+    question_parts = []
+    for question in practice_set.get('questions') or []:
+        question_parts.append(question.get('question') or question.get('statement') or '')
+        question_parts.append(str(question.get('answer') or ''))
+
+    return passage, headings, ' '.join(question_parts)
+
+def index_practice_set(practice_id, practice_set):
+    """Add or replace a practice set in the search index"""
+    passage, headings, questions = extract_search_fields(practice_set)
+    created_at = practice_set.get('created_at')
+    if created_at:
+        try:
+            created_at = normalize_timestamp(created_at)
+        except ValueError:
+            pass
+
+    with search_index_lock:
+        conn = get_search_connection()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT rowid FROM practice_set_meta WHERE practice_id = ?",
+                    (practice_id,)
+                ).fetchone()
+                if row:
+                    conn.execute("DELETE FROM practice_set_fts WHERE rowid = ?", (row['rowid'],))
+                    conn.execute("DELETE FROM practice_set_meta WHERE rowid = ?", (row['rowid'],))
+
+                cursor = conn.execute(
+                    "INSERT INTO practice_set_meta (practice_id, question_type, created_at) VALUES (?, ?, ?)",
+                    (practice_id, practice_set.get('question_type'), created_at)
+                )
+                conn.execute(
+                    "INSERT INTO practice_set_fts (rowid, passage, headings, questions) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, passage, headings, questions)
+                )
+        finally:
+            conn.close()
+
+@app.cli.command('rebuild-search-index')
+@click.option('--all', 'reindex_all', is_flag=True,
+              help="Reindex every practice set, not only those missing from the index.")
+def rebuild_search_index_command(reindex_all):
+    """Index practice set files that were saved before the search index existed"""
+    conn = get_search_connection()
+    try:
+        indexed = set() if reindex_all else {
+            row['practice_id'] for row in conn.execute("SELECT practice_id FROM practice_set_meta")
+        }
+    finally:
+        conn.close()
+
+    indexed_count = 0
+    for practice_file in PRACTICE_SETS_DIR.glob('*.json'):
+        practice_id = practice_file.stem
+        if practice_id in indexed:
+            continue
+        try:
+            practice_set = load_practice_set(practice_id)
+            if practice_set:
+                index_practice_set(practice_id, practice_set)
+                indexed_count += 1
+        except (ValueError, sqlite3.Error) as e:
+            click.echo(f"Error indexing practice set {practice_id}: {str(e)}", err=True)
+    click.echo(f"Indexed {indexed_count} practice sets")
+
+def build_match_query(query):
+    """Turn free text into an FTS5 query of quoted terms (last term prefix-matched)"""
+    terms = [term.replace('"', '""') for term in query.split() if term.strip('"')]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+def search_practice_sets(query, question_type=None, date_from=None, date_to=None, limit=20, offset=0):
+    """Search the practice set library, best matches first
+
+    date_from and date_to must already be normalized with normalize_timestamp.
+    """
+    match_query = build_match_query(query)
+    if match_query is None:
+        return []
+
+    sql = """
+        SELECT m.practice_id, m.question_type, m.created_at,
+               snippet(practice_set_fts, -1, '[', ']', '...', 16) AS snippet,
+               bm25(practice_set_fts, 1.0, 4.0, 2.0) AS score
+        FROM practice_set_fts
+        JOIN practice_set_meta m ON m.rowid = practice_set_fts.rowid
+        WHERE practice_set_fts MATCH ?
+    """
+    params = [match_query]
+    if question_type:
+        sql += " AND m.question_type = ?"
+        params.append(question_type)
+    if date_from:
+        sql += " AND m.created_at >= ?"
+        params.append(date_from)
+    if date_to:
+        sql += " AND m.created_at <= ?"
+        params.append(date_to)
+    sql += " ORDER BY score LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+
+    conn = get_search_connection()
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+# --- End Search Index ---
+
+# --- Static Snapshots ---
+def write_file_atomic(path, data):
+    """Write bytes to a file so readers never see a partial file"""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def snapshot_pointer_path(practice_id, target_dir=SNAPSHOT_DIR):
+    """Return the pointer file of a practice set, rejecting IDs that are not UUIDs"""
+    practice_id = str(uuid.UUID(practice_id))
+    return target_dir.parent / SNAPSHOT_POINTER_SUBDIR / f"{practice_id}.json"
+
+def publish_practice_set(practice_id, practice_set, target_dir=SNAPSHOT_DIR):
+    """Write a content-hashed, pre-compressed JSON snapshot of a practice set"""
+    # The share URL depends on the host serving the set, so clients add it
+    snapshot = {key: value for key, value in practice_set.items() if key != 'shareUrl'}
+    body = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    content_hash = hashlib.sha256(body).hexdigest()[:16]
+    file_name = f"{practice_id}.{content_hash}.json"
+    
+    target_dir.mkdir(parents=True, exist_ok=True)
+    snapshot_file = target_dir / file_name
+    if not snapshot_file.exists():
+        write_file_atomic(target_dir / f"{file_name}.gz", gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            write_file_atomic(target_dir / f"{file_name}.br", brotli.compress(body, quality=11))
+        # Written last: an existing .json means its compressed variants exist too
+        write_file_atomic(snapshot_file, body)
+    
+    # One pointer file per set, replaced atomically, so concurrent publishers
+    # (other workers, the CLI) never overwrite each other's entries
+    pointer_file = snapshot_pointer_path(practice_id, target_dir)
+    pointer_file.parent.mkdir(parents=True, exist_ok=True)
+    write_file_atomic(pointer_file, json.dumps({'file': file_name}).encode('utf-8'))
+    
+    return file_name
+
+def get_snapshot_file_name(practice_id):
+    """Return the published snapshot file name for a practice set, if any"""
+    try:
+        with open(snapshot_pointer_path(practice_id), 'r', encoding='utf-8') as f:
+            return json.load(f)['file']
+    except (OSError, ValueError, KeyError):
+        return None
+
+@app.route(f'/static/{SNAPSHOT_POINTER_SUBDIR}/<path:filename>')
+def practice_set_snapshot_pointer(filename):
+    """Serve a snapshot pointer with a short cache lifetime"""
+    return send_from_directory(
+        SNAPSHOT_DIR.parent / SNAPSHOT_POINTER_SUBDIR, filename,
+        mimetype='application/json', max_age=SNAPSHOT_POINTER_MAX_AGE
+    )
+
+@app.route(f'/static/{SNAPSHOT_SUBDIR}/<path:filename>')
+def practice_set_snapshot(filename):
+    """Serve a practice set snapshot, pre-compressed when the client allows it"""
+    encodings = [('br', '.br'), ('gzip', '.gz')]
+    for encoding, suffix in encodings:
+        if encoding in request.accept_encodings and (SNAPSHOT_DIR / f"{filename}{suffix}").exists():
+            response = send_from_directory(
+                SNAPSHOT_DIR, f"{filename}{suffix}",
+                mimetype='application/json', max_age=SNAPSHOT_MAX_AGE
+            )
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(SNAPSHOT_DIR, filename, max_age=SNAPSHOT_MAX_AGE)
+    
+    response.headers['Cache-Control'] = f"public, max-age={SNAPSHOT_MAX_AGE}, immutable"
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.cli.command('publish-practice-sets')
+@click.option('--target', type=click.Choice(['static', 'public']), default='static',
+              help="'static' for the Flask deploy, 'public' for Netlify.")
+def publish_practice_sets_command(target):
+    """Publish static snapshots of every saved practice set"""
+    target_dir = SNAPSHOT_DIR if target == 'static' else NETLIFY_SNAPSHOT_DIR
+    published = 0
+    for practice_file in PRACTICE_SETS_DIR.glob('*.json'):
+        try:
+            practice_set = load_practice_set(practice_file.stem)
+            if practice_set:
+                publish_practice_set(practice_file.stem, practice_set, target_dir)
+                published += 1
+        except ValueError as e:
+            click.echo(f"Error publishing practice set {practice_file.stem}: {str(e)}", err=True)
+    click.echo(f"Published {published} practice sets to {target_dir}")
+# --- End Static Snapshots ---
+
+@app.route('/api/practice-sets/search', methods=['GET'])
+def search_practice_sets_route():
+    """Search saved practice sets by topic, question type and date"""
+    query = request.args.get('q', '').strip()
+    question_type = request.args.get('question_type') or None
+    date_from = request.args.get('from') or None
+    date_to = request.args.get('to') or None
+
+    if not query:
+        return jsonify({"error": "No search query provided"}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+
+    try:
+        if date_from:
+            date_from = normalize_timestamp(date_from)
+        if date_to:
+            date_to = normalize_timestamp(date_to, end_of_day=True)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid date: {str(e)}"}), 400
+
+    try:
+        results = search_practice_sets(query, question_type, date_from, date_to, limit, offset)
+    except sqlite3.Error as e:
+        print(f"Error searching practice sets: {str(e)}")
+        return jsonify({"error": "Search failed due to a server error."}), 500
+
+    for result in results:
+        result['shareUrl'] = f"{request.host_url}?id={result['practice_id']}"
+
+    return jsonify({
+        'query': query,
+        'count': len(results),
+        'results': results
+    })
+
 @app.route('/api/job-status', methods=['GET'])
 def check_job_status():
     """Check the status of an asynchronous job"""
@@ -544,6 +1123,12 @@ def get_practice_set():
     if practice_id is None:
         return jsonify({"error": "No practice set has been generated yet"}), 404
     
+    # Shared sets never change, so send explicit IDs to their static snapshot
+    if 'id' in request.args:
+        file_name = get_snapshot_file_name(practice_id)
+        if file_name:
+            return redirect(f"/static/{SNAPSHOT_SUBDIR}/{file_name}")
+    
     practice_set = load_practice_set(practice_id)
     if practice_set is None:
         return jsonify({"error": "Practice set not found"}), 404
@@ -553,14 +1138,189 @@ def get_practice_set():
     
     return jsonify(practice_set)
 
+# --- Offline Dictionary ---
+# Compiled layout (little-endian): b'ENT2', entry count N, N + 1 record offsets,
+# then the records "english\tpos\ttürkçe" sorted by their UTF-8 English headword
+# (senses of one headword keep their word list order). The file is memory-mapped,
+# so all workers share one copy in the page cache.
+DICTIONARY_MAGIC = b'ENT2'
+DICTIONARY_HEADER = struct.Struct('<4sI')
+DICTIONARY_OFFSET = struct.Struct('<I')
+
+# Irregular inflections that suffix stripping cannot undo
+IRREGULAR_FORMS = {
+    'am': 'be', 'is': 'be', 'are': 'be', 'was': 'be', 'were': 'be', 'been': 'be',
+    'has': 'have', 'had': 'have', 'did': 'do', 'does': 'do', 'done': 'do',
+    'went': 'go', 'gone': 'go', 'came': 'come', 'became': 'become', 'began': 'begin',
+    'begun': 'begin', 'bought': 'buy', 'brought': 'bring', 'built': 'build',
+    'caught': 'catch', 'chose': 'choose', 'chosen': 'choose', 'drew': 'draw',
+    'drawn': 'draw', 'drank': 'drink', 'drove': 'drive', 'driven': 'drive',
+    'ate': 'eat', 'eaten': 'eat', 'fell': 'fall', 'fallen': 'fall', 'felt': 'feel',
+    'fought': 'fight', 'found': 'find', 'flew': 'fly', 'flown': 'fly',
+    'forgot': 'forget', 'forgotten': 'forget', 'gave': 'give', 'given': 'give',
+    'got': 'get', 'gotten': 'get', 'grew': 'grow', 'grown': 'grow', 'heard': 'hear',
+    'held': 'hold', 'hid': 'hide', 'hidden': 'hide', 'kept': 'keep', 'knew': 'know',
+    'known': 'know', 'led': 'lead', 'lost': 'lose', 'made': 'make', 'meant': 'mean',
+    'met': 'meet', 'paid': 'pay', 'ran': 'run', 'rose': 'rise', 'risen': 'rise',
+    'said': 'say', 'saw': 'see', 'seen': 'see', 'sold': 'sell', 'sent': 'send',
+    'sang': 'sing', 'sung': 'sing', 'sat': 'sit', 'slept': 'sleep', 'spoke': 'speak',
+    'spoken': 'speak', 'spent': 'spend', 'stood': 'stand', 'struck': 'strike',
+    'swam': 'swim', 'took': 'take', 'taken': 'take', 'taught': 'teach', 'told': 'tell',
+    'threw': 'throw', 'thrown': 'throw', 'understood': 'understand', 'wore': 'wear',
+    'worn': 'wear', 'won': 'win', 'wrote': 'write', 'written': 'write',
+    'better': 'good', 'best': 'good', 'worse': 'bad', 'worst': 'bad',
+    'children': 'child', 'men': 'man', 'women': 'woman', 'feet': 'foot',
+    'teeth': 'tooth', 'mice': 'mouse', 'lives': 'life', 'leaves': 'leaf',
+    'wives': 'wife', 'criteria': 'criterion', 'phenomena': 'phenomenon',
+    'analyses': 'analysis', 'crises': 'crisis',
+}
+
+# Parts of speech an inflected form may come from
+NOUN_OR_VERB = frozenset({'n', 'v'})
+VERB = frozenset({'v'})
+ADJECTIVE = frozenset({'adj'})
+
+# (suffix, replacement, parts of speech of the stem) for inflectional endings
+# only, tried in order after the exact and irregular forms
+SUFFIX_RULES = [
+    ("'s", '', frozenset({'n'})),
+    ('ies', 'y', NOUN_OR_VERB), ('es', '', NOUN_OR_VERB), ('s', '', NOUN_OR_VERB),
+    ('ied', 'y', VERB), ('ed', '', VERB), ('ed', 'e', VERB), ('ing', '', VERB), ('ing', 'e', VERB),
+    ('ier', 'y', ADJECTIVE), ('iest', 'y', ADJECTIVE),
+    ('er', '', ADJECTIVE), ('er', 'e', ADJECTIVE), ('est', '', ADJECTIVE), ('est', 'e', ADJECTIVE),
+]
+
+# Endings after which a doubled final consonant is undone: "stopped" -> "stop"
+DOUBLING_SUFFIXES = ('ed', 'ing', 'er', 'est')
+
+def build_dictionary(source=DICTIONARY_SOURCE, target=DICTIONARY_PATH):
+    """Compile the tab-separated word list into the sorted on-disk lookup file"""
+    entries = {}
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            english, pos, turkish = line.rstrip('\n').split('\t', 2)
+            entries.setdefault((english.strip().lower(), pos.strip()), turkish.strip())
+    
+    # Sort by headword only; sorted() is stable, so senses keep word list order
+    senses = sorted(entries.items(), key=lambda item: item[0][0].encode('utf-8'))
+    records = [f"{english}\t{pos}\t{turkish}".encode('utf-8') for (english, pos), turkish in senses]
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    
+    data = b''.join([
+        DICTIONARY_HEADER.pack(DICTIONARY_MAGIC, len(records)),
+        struct.pack(f'<{len(offsets)}I', *offsets),
+        *records
+    ])
+    write_file_atomic(target, data)
+
+def dictionary_is_current():
+    """Check that the compiled dictionary exists, matches this format and is newer than the word list"""
+    if not DICTIONARY_PATH.exists() or DICTIONARY_PATH.stat().st_mtime < DICTIONARY_SOURCE.stat().st_mtime:
+        return False
+    with open(DICTIONARY_PATH, 'rb') as f:
+        return f.read(len(DICTIONARY_MAGIC)) == DICTIONARY_MAGIC
+
+def get_dictionary():
+    """Return the memory-mapped dictionary, compiling it first if it is stale"""
+    global dictionary_map
+    
+    if dictionary_map is not None:
+        return dictionary_map
+    
+    with dictionary_lock:
+        if dictionary_map is None:
+            if not dictionary_is_current():
+                build_dictionary()
+            with open(DICTIONARY_PATH, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mapped[:len(DICTIONARY_MAGIC)] != DICTIONARY_MAGIC:
+                mapped.close()
+                raise ValueError(f"{DICTIONARY_PATH} is not a compiled dictionary")
+            dictionary_map = mapped
+    return dictionary_map
+
+def dictionary_find(headword, parts_of_speech=None):
+    """Return the first translation of a headword, optionally limited to some parts of speech"""
+    mapped = get_dictionary()
+    _, count = DICTIONARY_HEADER.unpack_from(mapped, 0)
+    offsets_start = DICTIONARY_HEADER.size
+    records_start = offsets_start + (count + 1) * DICTIONARY_OFFSET.size
+    key = headword.encode('utf-8')
+    
+    def read_record(index):
+        start, end = struct.unpack_from('<2I', mapped, offsets_start + index * DICTIONARY_OFFSET.size)
+        return mapped[records_start + start:records_start + end].split(b'\t', 2)
+    
+    # Binary search for the first record of the headword
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if read_record(middle)[0] < key:
+            low = middle + 1
+        else:
+            high = middle
+    
+    # Then walk its senses in word list order
+    for index in range(low, count):
+        english, pos, turkish = read_record(index)
+        if english != key:
+            break
+        if parts_of_speech is None or pos.decode('ascii') in parts_of_speech:
+            return turkish.decode('utf-8')
+    return None
+
+def lemma_candidates(word):
+    """Yield (headword, allowed parts of speech) pairs the word may be a form of"""
+    yield word, None
+    if word in IRREGULAR_FORMS:
+        yield IRREGULAR_FORMS[word], None
+    for suffix, replacement, parts_of_speech in SUFFIX_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            stem = word[:-len(suffix)]
+            yield stem + replacement, parts_of_speech
+            if (not replacement and suffix in DOUBLING_SUFFIXES and len(stem) > 2
+                    and stem[-1] == stem[-2] and stem[-1] not in 'aeiou'):
+                yield stem[:-1], parts_of_speech
+
+def lookup_translation(text):
+    """Translate a single English word offline as (headword, translation), or return None"""
+    word = text.strip().strip('.,;:!?"()[]{}\u2018\u2019\u201c\u201d').lower().replace('\u2019', "'")
+    if not word or not word.replace("'", '').isalpha():
+        # Phrases, hyphenated compounds and numbers go to the model
+        return None
+    
+    for candidate, parts_of_speech in lemma_candidates(word):
+        translation = dictionary_find(candidate, parts_of_speech)
+        if translation is not None:
+            return candidate, translation
+    return None
+# --- End Offline Dictionary ---
+
 @app.route('/api/translate', methods=['POST'])
 def translate_word():
-    """Translate a word from English to Turkish using Gemini API"""
+    """Translate a word from English to Turkish, using Gemini API for dictionary misses"""
     # Get data from the request
     data = request.get_json()
     word = data.get('word', '')
     custom_api_key = data.get('apiKey', '')
     
+    if not word:
+        return jsonify({"error": "No word provided"}), 400
+    
+    # Common words are answered locally without spending API quota
+    try:
+        match = lookup_translation(word)
+    except (OSError, ValueError) as e:
+        print(f"Error reading offline dictionary: {str(e)}")
+        match = None
+    if match is not None:
+        lemma, translation = match
+        return jsonify({"word": word, "lemma": lemma, "translation": translation, "source": "dictionary"})
+    
     # Use the custom API key if provided, otherwise fall back to environment key
     api_key_to_use = custom_api_key if custom_api_key else GEMINI_API_KEY
     
@@ -568,9 +1328,6 @@ def translate_word():
         return jsonify({"error": "No Gemini API key available"}), 500
     
     try:
-        if not word:
-            return jsonify({"error": "No word provided"}), 400
-        
         # Configure the model with potentially custom API key
         genai.configure(api_key=api_key_to_use)
         model = genai.GenerativeModel('gemini-2.0-flash')
@@ -589,7 +1346,7 @@ def translate_word():
         )
         translation = response.text.strip()
         
-        return jsonify({"word": word, "translation": translation})
+        return jsonify({"word": word, "translation": translation, "source": "gemini"})
     
     except Exception as e:
         print(f"Error translating word: {str(e)}")
@@ -36,8 +36,43 @@ function initialize() {
     passageElement.addEventListener('click', handleWordClick);
 }
 
+async function fetchPublishedPracticeSet(practiceId) {
+    // Published sets are immutable static files named by a small per-ID pointer
+    try {
+        const pointerResponse = await fetch(`/static/practice-sets-latest/${encodeURIComponent(practiceId)}.json`);
+        if (!pointerResponse.ok) {
+            return null;
+        }
+        const pointer = await pointerResponse.json();
+        if (!pointer.file) {
+            return null;
+        }
+        
+        const response = await fetch(`/static/practice-sets/${encodeURIComponent(pointer.file)}`);
+        if (!response.ok) {
+            return null;
+        }
+        const data = await response.json();
+        data.shareUrl = `${window.location.origin}/?id=${practiceId}`;
+        return data;
+    } catch (error) {
+        console.error('Error fetching published practice set:', error);
+        return null;
+    }
+}
+
 async function fetchExistingPracticeSet(practiceId = null) {
     try {
+        if (practiceId) {
+            const published = await fetchPublishedPracticeSet(practiceId);
+            if (published) {
+                currentPracticeSet = published;
+                currentPracticeId = published.id;
+                displayPracticeSet(published);
+                return;
+            }
+        }
+        
         // Construct URL with optional ID parameter
         let url = '/.netlify/functions/api/api/practice-set';
         if (practiceId) {
@@ -288,7 +323,11 @@ async function handleWordClick(event) {
                 const data = await response.json();
                 
                 // Display the translation
-                translatedWordElement.textContent = `${selectedText}: ${data.translation}`;
+                // Inflected forms are translated through their dictionary headword
+                const label = data.lemma && data.lemma !== selectedText.toLowerCase()
+                    ? `${selectedText} (${data.lemma})`
+                    : selectedText;
+                translatedWordElement.textContent = `${label}: ${data.translation}`;
                 positionTranslationModal(event);
             } catch (error) {
                 console.error('Error translating word:', error);
@@ -404,17 +404,56 @@ function switchTab(tabName) {
     }
 }
 
+async function fetchPublishedPracticeSet(practiceId) {
+    // Published sets are immutable static files named by a small per-ID pointer
+    try {
+        const pointerResponse = await fetch(`/static/practice-sets-latest/${encodeURIComponent(practiceId)}.json`);
+        if (!pointerResponse.ok) {
+            return null;
+        }
+        const pointer = await pointerResponse.json();
+        if (!pointer.file) {
+            return null;
+        }
+        
+        const response = await fetch(`/static/practice-sets/${encodeURIComponent(pointer.file)}`);
+        if (!response.ok) {
+            return null;
+        }
+        const data = await response.json();
+        data.shareUrl = `${window.location.origin}/?id=${practiceId}`;
+        return data;
+    } catch (error) {
+        console.error('Error fetching published practice set:', error);
+        return null;
+    }
+}
+
 async function fetchExistingPracticeSet(practiceId = null) {
     try {
+        if (practiceId) {
+            const published = await fetchPublishedPracticeSet(practiceId);
+            if (published) {
+                currentPracticeSet = published;
+                currentPracticeId = published.id;
+                displayPracticeSet(published);
+                return;
+            }
+        }
+        
         // Construct URL with optional ID parameter
         let url = '/api/practice-set';
         if (practiceId) {
             url += `?id=${practiceId}`;
         }
         
+        // Shared sets may be redirected to their static snapshot, which has no share URL
         const response = await fetch(url);
         if (response.ok) {
             const data = await response.json();
+            if (!data.shareUrl && data.id) {
+                data.shareUrl = `${window.location.origin}/?id=${data.id}`;
+            }
             currentPracticeSet = data;
             currentPracticeId = data.id;
             displayPracticeSet(data);
@@ -1128,7 +1167,11 @@ async function handleWordClick(event) {
                 const data = await response.json();
                 
                 // Display the translation
-                translatedWordElement.textContent = `${selectedText}: ${data.translation}`;
+                // Inflected forms are translated through their dictionary headword
+                const label = data.lemma && data.lemma !== selectedText.toLowerCase()
+                    ? `${selectedText} (${data.lemma})`
+                    : selectedText;
+                translatedWordElement.textContent = `${label}: ${data.translation}`;
                 positionTranslationModal(event);
             } catch (error) {
                 console.error('Error translating word:', error);